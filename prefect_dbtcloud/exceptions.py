@@ -2,6 +2,7 @@
 Exceptions to be raised in case of issues or unexpected behaviours
 of dbt Cloud.
 """
+from typing import Dict, List, Optional
 
 
 class DbtCloudBaseException(Exception):
@@ -22,6 +23,22 @@ class TriggerDbtCloudRunFailed(DbtCloudBaseException):
     pass
 
 
+class TriggerDbtCloudRunsFailed(TriggerDbtCloudRunFailed):
+    """Raised when some dbt job runs of a batch cannot be triggered"""
+
+    def __init__(self, message: str, job_runs: List[Optional[Dict]]):
+        """
+        Build a `TriggerDbtCloudRunsFailed` exception.
+
+        Args:
+            message: The exception message.
+            job_runs: The trigger run result of each job of the batch,
+                or `None` for the jobs whose run could not be triggered.
+        """
+        super().__init__(message)
+        self.job_runs = job_runs
+
+
 class GetDbtCloudRunFailed(DbtCloudBaseException):
     """Raised when details for a dbt Cloud job run cannot be retrieved"""
 
@@ -2,18 +2,142 @@
 Tasks to interact with dbt Cloud
 """
 import os
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional
 
 from prefect import get_run_logger, task
 
 from prefect_dbtcloud.exceptions import (
     DbtCloudConfigurationException,
     DbtCloudListArtifactsFailed,
+    TriggerDbtCloudRunsFailed,
 )
 from prefect_dbtcloud.utils import dbtCloudClient
 
+try:
+    from prefect.cache_policies import NO_CACHE
+except ImportError:
+    # Prefect 2 does not cache task results unless a cache key function is set
+    _TASK_OPTIONS = {}
+else:
+    # Every call must hit dbt Cloud: a cached result would report
+    # a stale job run instead of triggering a new one
+    _TASK_OPTIONS = {"cache_policy": NO_CACHE}
 
-@task
+_DEFAULT_API_DOMAIN = "cloud.getdbt.com"
+
+_MSG_ACCOUNT_ID_MISSING = (
+    "dbt Cloud Account ID cannot be None. "
+    "Please provide an Account ID or the name of the env var that contains it."
+)
+_MSG_JOB_ID_MISSING = (
+    "dbt Cloud Job ID cannot be None. "
+    "Please provide a Job ID or the name of the env var that contains it."
+)
+_MSG_TOKEN_MISSING = (
+    "dbt Cloud token cannot be None. "
+    "Please provide a token or the name of the env var that contains it."
+)
+_MSG_CAUSE_MISSING = (
+    "Cause cannot be None. Please provide a cause to trigger the dbt Cloud job."
+)
+_MSG_POLL_FREQUENCY_INVALID = (
+    "Poll frequency must be a number of seconds greater than 0."
+)
+_MSG_POLL_BACKOFF_INVALID = (
+    "Poll backoff must be greater than or equal to 1. "
+    "Use 1 to poll at a fixed frequency."
+)
+_MSG_MAX_CONCURRENCY_INVALID = (
+    "Max concurrency must be a number of job runs greater than 0."
+)
+
+
+def _require(value: Any, message: str) -> None:
+    """
+    Make sure that a mandatory configuration value has been provided.
+
+    Args:
+        value: The configuration value to check.
+        message: The message of the exception raised if `value` is `None`.
+
+    Raises:
+        `DbtCloudConfigurationException` if `value` is `None`.
+    """
+    if value is None:
+        raise DbtCloudConfigurationException(message)
+
+
+@lru_cache(maxsize=32)
+def _get_client(account_id: int, token: str, api_domain: str) -> dbtCloudClient:
+    """
+    Return a `dbtCloudClient` for the given account, token and domain,
+    reusing the one already built by a previous task call if any.
+    Sharing the client lets consecutive calls reuse its open connections
+    instead of paying a new TCP and TLS handshake.
+
+    Args:
+        account_id: The identifier of the dbt Cloud account.
+        token: The API token to use to authenticate on dbt Cloud.
+        api_domain: The URL of the dbt Cloud account.
+
+    Returns:
+        A `dbtCloudClient` configured to interact with the
+        specified dbt Cloud account
+    """
+    return dbtCloudClient(account_id=account_id, token=token, api_domain=api_domain)
+
+
+class _DbtCloudCredentials(NamedTuple):
+    """dbt Cloud credentials resolved from task arguments and env vars"""
+
+    account_id: Optional[int]
+    token: Optional[str]
+    api_domain: str
+
+
+def _resolve_credentials(
+    account_id: Optional[int],
+    token: Optional[str],
+    api_domain: Optional[str],
+    account_id_env_var_name: str,
+    token_env_var_name: str,
+) -> _DbtCloudCredentials:
+    """
+    Fill in the dbt Cloud credentials that have not been provided explicitly
+    with the content of the matching env vars, or the default API domain.
+
+    Args:
+        account_id: dbt Cloud account ID, if provided.
+        token: dbt Cloud token, if provided.
+        api_domain: Custom domain for API call, if provided.
+        account_id_env_var_name: the name of the env var
+            that contains the dbt Cloud account ID.
+        token_env_var_name: the name of the env var
+            that contains the dbt Cloud token.
+
+    Returns:
+        The resolved credentials, with the account ID already converted to `int`.
+        Values that are neither provided nor set in the env are `None`.
+    """
+    # Credentials injected directly, e.g. from a Prefect Block,
+    # take precedence over env vars, which are only read when needed
+    if account_id is None:
+        env_account_id = os.environ.get(account_id_env_var_name)
+        account_id = int(env_account_id) if env_account_id is not None else None
+
+    if token is None:
+        token = os.environ.get(token_env_var_name)
+
+    return _DbtCloudCredentials(
+        account_id=account_id,
+        token=token,
+        api_domain=api_domain or _DEFAULT_API_DOMAIN,
+    )
+
+
+@task(**_TASK_OPTIONS)
 def run_job(
     cause: str,
     api_domain: Optional[str] = None,
@@ -26,6 +150,8 @@ def run_job(
     token_env_var_name: Optional[str] = "DBT_CLOUD_TOKEN",
     wait_for_job_run_completion: Optional[bool] = False,
     max_wait_time: Optional[int] = None,
+    poll_frequency_seconds: int = 10,
+    poll_backoff: float = 1.5,
 ) -> Dict:
     """
     Run a dbt Cloud job.
@@ -61,12 +187,24 @@ def run_job(
         max_wait_time: The number of seconds to wait for the dbt Cloud
             job to finish.
             Used only if `wait_for_job_run_completion` is `True`.
+        poll_frequency_seconds: The number of seconds to wait before
+            checking the status of the dbt Cloud job run again.
+            Default is `10`.
+            Used only if `wait_for_job_run_completion` is `True`.
+        poll_backoff: The factor the wait time between two status checks
+            is multiplied by after each check, up to 60 seconds
+            or `poll_frequency_seconds`, whichever is greater.
+            Default is `1.5`. Use `1` to poll at a fixed frequency.
+            Used only if `wait_for_job_run_completion` is `True`.
 
     Raises:
         `DbtCloudConfigurationException` if the `account_id` is not specified.
         `DbtCloudConfigurationException` if the `job_id` is not specified.
         `DbtCloudConfigurationException` if the `token` is not specified.
         `DbtCloudConfigurationException` if the `cause` is not specified.
+        `DbtCloudConfigurationException` if `wait_for_job_run_completion` is `True`
+            and `poll_frequency_seconds` is not greater than 0
+            or `poll_backoff` is lower than 1.
 
     Returns:
         When `wait_for_job_run_completion` is `False`, then returns
@@ -81,51 +219,35 @@ def run_job(
             Please refere to the dbt Cloud Get Run API documentation
             for more information regarding the returned payload.
     """
-    if account_id is None and account_id_env_var_name in os.environ:
-        account_id = int(os.environ[account_id_env_var_name])
-
-    if account_id is None:
-        raise DbtCloudConfigurationException(
-            """
-            dbt Cloud Account ID cannot be None.
-            Please provide an Account ID or the name of the env var that contains it.
-            """
-        )
-
-    if job_id is None and job_id_env_var_name in os.environ:
-        job_id = int(os.environ[job_id_env_var_name])
+    account_id, token, api_domain = _resolve_credentials(
+        account_id=account_id,
+        token=token,
+        api_domain=api_domain,
+        account_id_env_var_name=account_id_env_var_name,
+        token_env_var_name=token_env_var_name,
+    )
 
     if job_id is None:
-        raise DbtCloudConfigurationException(
-            """
-            dbt Cloud Job ID cannot be None.
-            Please provide a Job ID or the name of the env var that contains it.
-            """
-        )
-
-    if api_domain is None:
-        api_domain = "cloud.getdbt.com"
+        env_job_id = os.environ.get(job_id_env_var_name)
+        job_id = int(env_job_id) if env_job_id is not None else None
 
-    if token is None and token_env_var_name in os.environ:
-        token = os.environ.get(token_env_var_name)
+    for value, message in (
+        (account_id, _MSG_ACCOUNT_ID_MISSING),
+        (job_id, _MSG_JOB_ID_MISSING),
+        (token, _MSG_TOKEN_MISSING),
+        (cause, _MSG_CAUSE_MISSING),
+    ):
+        _require(value, message)
 
-    if token is None:
-        raise DbtCloudConfigurationException(
-            """
-            dbt Cloud token cannot be None.
-            Please provide a token or the name of the env var that contains it.
-            """
-        )
-
-    if cause is None:
-        raise DbtCloudConfigurationException(
-            """
-            Cause cannot be None.
-            Please provide a cause to trigger the dbt Cloud job.
-            """
-        )
+    # Check the polling configuration before triggering the job run,
+    # so that an invalid value does not leave a job run unattended
+    if wait_for_job_run_completion:
+        if poll_frequency_seconds is None or poll_frequency_seconds <= 0:
+            raise DbtCloudConfigurationException(_MSG_POLL_FREQUENCY_INVALID)
+        if poll_backoff is None or poll_backoff < 1:
+            raise DbtCloudConfigurationException(_MSG_POLL_BACKOFF_INVALID)
 
-    dbt_cloud_client = dbtCloudClient(
+    dbt_cloud_client = _get_client(
         account_id=account_id, token=token, api_domain=api_domain
     )
 
@@ -138,23 +260,151 @@ def run_job(
     if wait_for_job_run_completion:
 
         job_run_id = job_run["id"]
-        job_run_result = dbt_cloud_client.wait_for_job_run(
-            run_id=job_run_id,
-            max_wait_time=max_wait_time,
-        )
+        # The trigger response already describes the job run:
+        # if it has completed, there is no need to poll its status
+        if dbt_cloud_client.check_job_run_status(run_id=job_run_id, job_run=job_run):
+            job_run_result = job_run
+        else:
+            job_run_result = dbt_cloud_client.wait_for_job_run(
+                run_id=job_run_id,
+                max_wait_time=max_wait_time,
+                poll_frequency_seconds=poll_frequency_seconds,
+                poll_backoff=poll_backoff,
+            )
 
-        artifact_links = []
+        artifact_urls = []
         try:
-            artifact_links = dbt_cloud_client.list_run_artifact_links(run_id=job_run_id)
+            artifact_urls = dbt_cloud_client.list_run_artifact_urls(run_id=job_run_id)
         except DbtCloudListArtifactsFailed as err:
             logger = get_run_logger()
             logger.warning(
-                f"Unable to retrieve artifacts generated by dbt Cloud job run: {err}"
+                "Unable to retrieve artifacts generated by dbt Cloud job run: %s", err
             )
 
-        job_run_result["artifact_urls"] = [link for link, _ in artifact_links]
+        job_run_result["artifact_urls"] = artifact_urls
 
         return job_run_result
 
     else:
         return job_run
+
+
+@task(**_TASK_OPTIONS)
+def run_jobs_batch(
+    job_ids: List[int],
+    cause: str,
+    api_domain: Optional[str] = None,
+    account_id: Optional[int] = None,
+    token: Optional[str] = None,
+    additional_args: Optional[Dict] = None,
+    account_id_env_var_name: Optional[str] = "ACCOUNT_ID",
+    token_env_var_name: Optional[str] = "DBT_CLOUD_TOKEN",
+    max_concurrency: int = 8,
+) -> List[Dict]:
+    """
+    Run several dbt Cloud jobs of the same account at once.
+    Job runs are triggered concurrently, sharing the same connection pool.
+
+    Args:
+        job_ids: the dbt Cloud job IDs of the jobs to run.
+        cause: A string describing the reason for triggering the job runs.
+        api_domain (str, optional): Custom domain for API call.
+        account_id: dbt Cloud account ID.
+            Can also be passed as an env var.
+        token: dbt Cloud token.
+            Please note that this token must have access at least
+            to the dbt Trigger Job API.
+        additional_args: additional information to pass to the Trigger Job API
+            for every job run.
+            For a list of the possible information,
+            have a look at:
+            https://docs.getdbt.com/dbt-cloud/api-v2#operation/triggerRun
+        account_id_env_var_name:
+            the name of the env var that contains the dbt Cloud account ID.
+            Defaults is `'ACCOUNT_ID'`.
+            Used only if `account_id` is `None`.
+        token_env_var_name:
+            the name of the env var that contains the dbt Cloud token
+            Default to `'DBT_CLOUD_TOKEN'`.
+            Used only if `token` is `None`.
+        max_concurrency: The maximum number of job runs
+            to trigger at the same time. Must be greater than 0.
+            Default is `8`.
+
+    Raises:
+        `DbtCloudConfigurationException` if the `account_id` is not specified.
+        `DbtCloudConfigurationException` if the `token` is not specified.
+        `DbtCloudConfigurationException` if the `cause` is not specified.
+        `DbtCloudConfigurationException` if `max_concurrency`
+            is not greater than 0.
+        `TriggerDbtCloudRunsFailed` if any of the job runs cannot be triggered.
+            The other job runs are still triggered: their trigger run results
+            are available in the `job_runs` attribute of the exception.
+
+    Returns:
+        The trigger run results, in the same order as `job_ids`.
+            Each trigger run result is the dict under the `data` key.
+            Please refer to the dbt Cloud Trigger Run API documentation
+            for more information regarding the returned payload.
+    """
+    account_id, token, api_domain = _resolve_credentials(
+        account_id=account_id,
+        token=token,
+        api_domain=api_domain,
+        account_id_env_var_name=account_id_env_var_name,
+        token_env_var_name=token_env_var_name,
+    )
+
+    for value, message in (
+        (account_id, _MSG_ACCOUNT_ID_MISSING),
+        (token, _MSG_TOKEN_MISSING),
+        (cause, _MSG_CAUSE_MISSING),
+    ):
+        _require(value, message)
+
+    if max_concurrency is None or max_concurrency <= 0:
+        raise DbtCloudConfigurationException(_MSG_MAX_CONCURRENCY_INVALID)
+
+    dbt_cloud_client = _get_client(
+        account_id=account_id, token=token, api_domain=api_domain
+    )
+
+    def trigger_job_run(job_id: int) -> Dict:
+        """
+        Trigger a run of the given dbt Cloud job.
+
+        Args:
+            job_id: dbt Cloud job ID
+
+        Returns:
+            The trigger run result, namely the "data" key in the API response
+        """
+        return dbt_cloud_client.trigger_job_run(
+            job_id=job_id,
+            cause=cause,
+            additional_args=additional_args,
+        )
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = [executor.submit(trigger_job_run, job_id) for job_id in job_ids]
+
+    # Wait for every trigger request before reporting a failure,
+    # so that the job runs already triggered are not lost
+    job_runs = []
+    errors = {}
+    for job_id, future in zip(job_ids, futures):
+        try:
+            job_runs.append(future.result())
+        except Exception as err:
+            job_runs.append(None)
+            errors[job_id] = err
+
+    if errors:
+        triggered_run_ids = [job_run["id"] for job_run in job_runs if job_run]
+        raise TriggerDbtCloudRunsFailed(
+            f"Unable to trigger dbt Cloud job runs for job IDs: {list(errors)}. "
+            f"Job runs triggered: {triggered_run_ids}",
+            job_runs=job_runs,
+        ) from next(iter(errors.values()))
+
+    return job_runs
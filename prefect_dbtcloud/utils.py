@@ -1,11 +1,14 @@
 """
 Utilities and client to interact with dbt Cloud.
 """
-from time import sleep
+from random import uniform
+from time import monotonic, sleep
 from typing import Dict, List, Optional, Tuple
 
 import prefect
 from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from prefect_dbtcloud.exceptions import (
     DbtCloudListArtifactsFailed,
@@ -50,6 +53,28 @@ class dbtCloudClient:
 
     __USER_AGENT_HEADER = {"user-agent": f"prefect-{prefect.__version__}"}
 
+    # Upper bound of the number of seconds to wait
+    # between two consecutive calls to the Get Run API
+    __MAX_POLL_FREQUENCY_SECONDS = 60
+
+    # Fraction of the wait time between two status checks added as random
+    # jitter, so that job runs waited on at the same time do not poll in lockstep
+    __POLL_JITTER = 0.1
+
+    # Size of the pool of connections kept open to dbt Cloud,
+    # so that polling and concurrent calls reuse them
+    __POOL_CONNECTIONS = 8
+    __POOL_MAXSIZE = 32
+
+    # Retry transient network errors, e.g. a pooled connection
+    # closed by dbt Cloud between two polls.
+    # urllib3 only retries POST requests that never reached the server,
+    # so a job run is never triggered twice.
+    # Responses are never retried, not even when they carry a Retry-After
+    # header: the server would choose how long to sleep, regardless of
+    # the max_wait_time of the job run
+    __MAX_RETRIES = Retry(total=3, backoff_factor=0.1, respect_retry_after_header=False)
+
     def __init__(
         self,
         account_id: int,
@@ -77,6 +102,14 @@ class dbtCloudClient:
             "Authorization": f"Bearer {self.token}",
             **self.__USER_AGENT_HEADER,
         }
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=self.__POOL_CONNECTIONS,
+                pool_maxsize=self.__POOL_MAXSIZE,
+                max_retries=self.__MAX_RETRIES,
+            ),
+        )
 
     @classmethod
     def get_agent_header(cls) -> Dict:
@@ -169,7 +202,7 @@ class dbtCloudClient:
         Raises:
             `TriggerDbtCloudRunFailed`: when the response code is != 200
         """
-        data = additional_args if additional_args else {}
+        data = dict(additional_args) if additional_args else {}
         data["cause"] = cause
 
         url = self.dbt_cloud_trigger_job_api_endpoint_v2(job_id=job_id)
@@ -180,7 +213,42 @@ class dbtCloudClient:
 
         return trigger_request.json()["data"]
 
-    def wait_for_job_run(self, run_id: int, max_wait_time: int = None) -> Dict:
+    @staticmethod
+    def check_job_run_status(run_id: int, job_run: Dict) -> bool:
+        """
+        Check whether a dbt Cloud job run has completed successfully.
+
+        Args:
+            run_id: dbt Cloud job run ID
+            job_run: the job run details, as returned by dbt Cloud APIs
+
+        Returns:
+            `True` if the job run has completed successfully,
+            `False` if it has not finished yet
+
+        Raises:
+            `DbtCloudRunFailed`: if "finished_at" is not None
+                and the result status == 20
+            `DbtCloudRunCanceled`: if "finished_at" is not None
+                and the result status == 30
+        """
+        if job_run.get("finished_at"):
+            if job_run["status"] == 10:
+                return True
+            elif job_run["status"] == 20:
+                raise DbtCloudRunFailed(f"Job run with ID: {run_id} failed.")
+            elif job_run["status"] == 30:
+                raise DbtCloudRunCanceled(f"Job run with ID: {run_id} cancelled.")
+
+        return False
+
+    def wait_for_job_run(
+        self,
+        run_id: int,
+        max_wait_time: int = None,
+        poll_frequency_seconds: int = 10,
+        poll_backoff: float = 1.5,
+    ) -> Dict:
         """
         Get a dbt Cloud job run.
         Please note that this function will fail if any call to dbt Cloud APIs fail.
@@ -188,6 +256,13 @@ class dbtCloudClient:
         Args:
             run_id: dbt Cloud job run ID
             max_wait_time: the number od seconds to wait for the job to complete
+            poll_frequency_seconds: the number of seconds to wait
+                before checking the job run status again
+            poll_backoff: the factor the wait time between two status checks
+                is multiplied by after each check, up to 60 seconds
+                or `poll_frequency_seconds`, whichever is greater.
+                Use `1` to check the job run status at a fixed frequency.
+                Up to 10% of random jitter is added to each wait.
 
         Returns:
             The job run result, namely the "data" key in the API response
@@ -200,11 +275,16 @@ class dbtCloudClient:
             `DbtCloudRunTimedOut`: if run does not finish
                 before provided max_wait_time
         """
-        wait_time_between_api_calls = 10
-        elapsed_wait_time = 0
+        wait_time_between_api_calls = poll_frequency_seconds
+        # The backoff never polls more often than requested
+        max_wait_time_between_api_calls = max(
+            poll_frequency_seconds, self.__MAX_POLL_FREQUENCY_SECONDS
+        )
+        start_time = monotonic()
+        deadline = start_time + max_wait_time if max_wait_time else None
         url = self.dbt_cloud_get_run_api_endpoint_v2(run_id=run_id)
 
-        while not max_wait_time or elapsed_wait_time <= max_wait_time:
+        while True:
             with self.session.get(url) as get_run_request:
 
                 if get_run_request.status_code != 200:
@@ -212,33 +292,38 @@ class dbtCloudClient:
 
             result = get_run_request.json()["data"]
 
-            if result["finished_at"]:
-                if result["status"] == 10:
-                    return result
-                elif result["status"] == 20:
-                    raise DbtCloudRunFailed(f"Job run with ID: {run_id} failed.")
-                elif result["status"] == 30:
-                    raise DbtCloudRunCanceled(f"Job run with ID: {run_id} cancelled.")
+            if self.check_job_run_status(run_id=run_id, job_run=result):
+                return result
 
-            sleep(wait_time_between_api_calls)
-            elapsed_wait_time += wait_time_between_api_calls
+            now = monotonic()
+            if deadline is not None and now >= deadline:
+                raise DbtCloudRunTimedOut(
+                    "Max attempts reached while checking status of job run "
+                    f"with ID: {run_id} after {now - start_time:.0f} seconds"
+                )
 
-        raise DbtCloudRunTimedOut(
-            f"Max attempts reached while checking status of job run with ID: {run_id}"
-        )
+            wait_time = wait_time_between_api_calls + uniform(
+                0, wait_time_between_api_calls * self.__POLL_JITTER
+            )
+            # Do not sleep past the deadline, so that the status
+            # is checked one last time right when the time is up
+            if deadline is not None:
+                wait_time = min(wait_time, deadline - now)
+            sleep(wait_time)
+            wait_time_between_api_calls = min(
+                wait_time_between_api_calls * poll_backoff,
+                max_wait_time_between_api_calls,
+            )
 
-    def list_run_artifact_links(
-        self,
-        run_id: int,
-    ) -> List[Tuple[str, str]]:
+    def list_run_artifact_paths(self, run_id: int) -> List[str]:
         """
-        Lists URLs that can be used to download artifacts from a dbt run
+        Lists the paths of the artifacts generated by a dbt run
 
         Args:
             run_id: dbt Cloud job run ID
 
         Returns:
-            List of artifact download URLs
+            List of artifact paths
 
         Raises:
             `DbtCloudListArtifactsFailed`: if API to list dbt artifacts fails
@@ -250,7 +335,45 @@ class dbtCloudClient:
             if list_run_artifacts_response.status_code != 200:
                 raise DbtCloudListArtifactsFailed(list_run_artifacts_response.reason)
 
-        artifact_paths = list_run_artifacts_response.json().get("data")
+        return list_run_artifacts_response.json().get("data")
+
+    def list_run_artifact_urls(self, run_id: int) -> List[str]:
+        """
+        Lists URLs that can be used to download artifacts from a dbt run
+
+        Args:
+            run_id: dbt Cloud job run ID
+
+        Returns:
+            List of artifact download URLs
+
+        Raises:
+            `DbtCloudListArtifactsFailed`: if API to list dbt artifacts fails
+
+        """
+        artifact_paths = self.list_run_artifact_paths(run_id=run_id)
+        # All the download URLs share the same prefix: build it only once
+        base_url = self.dbt_cloud_get_run_artifact_endpoint_v2(run_id=run_id, path="")
+        return list(map(base_url.__add__, artifact_paths))
+
+    def list_run_artifact_links(
+        self,
+        run_id: int,
+    ) -> List[Tuple[str, str]]:
+        """
+        Lists URLs that can be used to download artifacts from a dbt run,
+        along with the path of each artifact
+
+        Args:
+            run_id: dbt Cloud job run ID
+
+        Returns:
+            List of artifact download URLs and artifact paths
+
+        Raises:
+            `DbtCloudListArtifactsFailed`: if API to list dbt artifacts fails
+
+        """
         return [
             (
                 self.dbt_cloud_get_run_artifact_endpoint_v2(
@@ -258,5 +381,5 @@ class dbtCloudClient:
                 ),
                 artifact_path,
             )
-            for artifact_path in artifact_paths
+            for artifact_path in self.list_run_artifact_paths(run_id=run_id)
         ]
@@ -0,0 +1,32 @@
+import pytest
+import responses
+
+
+@pytest.fixture
+def rsps():
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as mock:
+        yield mock
+
+
+class FakeClock:
+    """Virtual clock that only moves forward when the client sleeps"""
+
+    def __init__(self):
+        self.now = 0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture(autouse=True)
+def fake_clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr("prefect_dbtcloud.utils.monotonic", clock.monotonic)
+    monkeypatch.setattr("prefect_dbtcloud.utils.sleep", clock.sleep)
+    monkeypatch.setattr("prefect_dbtcloud.utils.uniform", lambda a, b: 0)
+    return clock
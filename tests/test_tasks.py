@@ -13,474 +13,523 @@ from prefect_dbtcloud.exceptions import (
     DbtCloudRunTimedOut,
     GetDbtCloudRunFailed,
     TriggerDbtCloudRunFailed,
+    TriggerDbtCloudRunsFailed,
+)
+from prefect_dbtcloud.tasks import (
+    _get_client,
+    _resolve_credentials,
+    run_job,
+    run_jobs_batch,
 )
-from prefect_dbtcloud.tasks import run_job
 from prefect_dbtcloud.utils import dbtCloudClient
 
+_AGENT_MATCH = [matchers.header_matcher(dbtCloudClient.get_agent_header())]
+
+_FINISHED_AT = "2019-08-24T14:15:22Z"
+_RUN_RUNNING = {"data": {"finished_at": None}}
+
+
+def _trigger_url(account_id, job_id, api_domain="cloud.getdbt.com"):
+    return f"https://{api_domain}/api/v2/accounts/{account_id}/jobs/{job_id}/run/"
+
+
+def _run_url(account_id, run_id, api_domain="cloud.getdbt.com"):
+    return f"https://{api_domain}/api/v2/accounts/{account_id}/runs/{run_id}/"
+
+
+def _artifacts_url(account_id, run_id, api_domain="cloud.getdbt.com"):
+    return f"{_run_url(account_id, run_id, api_domain=api_domain)}artifacts/"
+
+
+def _register_run_stubs(
+    mocked,
+    account_id,
+    job_id,
+    run_id=123,
+    *,
+    trigger_status=200,
+    trigger_data=None,
+    pending_polls=0,
+    run_status=None,
+    get_status=200,
+    artifacts=None,
+    artifacts_status=200,
+    api_domain="cloud.getdbt.com",
+):
+    """
+    Register the dbt Cloud API responses used by a single `run_job` call:
+    the trigger POST, then `pending_polls` unfinished runs followed by a
+    finished run with `run_status`, then the artifacts listing.
+    A non-200 status registers a failing response for that step instead,
+    and stubs for steps that are not configured are left out.
+    """
+    trigger_url = _trigger_url(account_id, job_id, api_domain=api_domain)
+    if trigger_status != 200:
+        mocked.add(
+            responses.POST, trigger_url, status=trigger_status, match=_AGENT_MATCH
+        )
+        return
+    mocked.add(
+        responses.POST,
+        trigger_url,
+        json={"data": trigger_data or {"id": run_id}},
+        match=_AGENT_MATCH,
+    )
 
-def test_run_without_account_id_raises():
-    @flow
-    def test_flow():
-        return run_job(cause="cause")
-
-    msg_match = "dbt Cloud Account ID cannot be None."
-    with pytest.raises(DbtCloudConfigurationException, match=msg_match):
-        test_flow().result().result()
-
-
-def test_run_without_job_id_raises():
-    @flow
-    def test_flow():
-        return run_job(cause="cause", account_id=123)
-
-    msg_match = "dbt Cloud Job ID cannot be None."
-    with pytest.raises(DbtCloudConfigurationException, match=msg_match):
-        test_flow().result().result()
+    run_url = _run_url(account_id, run_id, api_domain=api_domain)
+    if get_status != 200:
+        mocked.add(responses.GET, run_url, status=get_status, match=_AGENT_MATCH)
+    for _ in range(pending_polls):
+        mocked.add(responses.GET, run_url, json=_RUN_RUNNING, match=_AGENT_MATCH)
+    if run_status is not None:
+        mocked.add(
+            responses.GET,
+            run_url,
+            json={
+                "data": {
+                    "id": run_id,
+                    "status": run_status,
+                    "finished_at": _FINISHED_AT,
+                }
+            },
+            match=_AGENT_MATCH,
+        )
 
+    artifacts_url = _artifacts_url(account_id, run_id, api_domain=api_domain)
+    if artifacts_status != 200:
+        mocked.add(
+            responses.GET, artifacts_url, status=artifacts_status, match=_AGENT_MATCH
+        )
+    elif artifacts is not None:
+        mocked.add(
+            responses.GET,
+            artifacts_url,
+            json={"data": artifacts},
+            match=_AGENT_MATCH,
+        )
 
-def test_run_without_token_raises():
-    @flow
-    def test_flow():
-        return run_job(cause="cause", account_id=123, job_id=123)
 
-    msg_match = "dbt Cloud token cannot be None."
+@flow
+def _harness(task, kwargs):
+    return task(**kwargs)
+
+
+@pytest.mark.parametrize(
+    "task, kwargs, msg_match",
+    [
+        pytest.param(
+            run_job,
+            {"cause": "cause"},
+            "dbt Cloud Account ID cannot be None.",
+            id="run_job-account_id",
+        ),
+        pytest.param(
+            run_job,
+            {"cause": "cause", "account_id": 123},
+            "dbt Cloud Job ID cannot be None.",
+            id="run_job-job_id",
+        ),
+        pytest.param(
+            run_job,
+            {"cause": "cause", "account_id": 123, "job_id": 123},
+            "dbt Cloud token cannot be None.",
+            id="run_job-token",
+        ),
+        pytest.param(
+            run_job,
+            {"cause": None, "account_id": 123, "job_id": 123, "token": "abc"},
+            "Cause cannot be None.",
+            id="run_job-cause",
+        ),
+        pytest.param(
+            run_jobs_batch,
+            {"job_ids": [123], "cause": "cause"},
+            "dbt Cloud Account ID cannot be None.",
+            id="run_jobs_batch-account_id",
+        ),
+    ],
+)
+def test_missing_configuration_raises(task, kwargs, msg_match):
     with pytest.raises(DbtCloudConfigurationException, match=msg_match):
-        test_flow().result().result()
-
-
-def test_run_with_cause_none_raises():
-    @flow
-    def test_flow():
-        return run_job(cause=None, account_id=123, job_id=123, token="abc")
-
-    msg_match = "Cause cannot be None."
+        task.fn(**kwargs)
+
+
+@pytest.mark.parametrize(
+    "poll_kwargs, msg_match",
+    [
+        pytest.param(
+            {"poll_frequency_seconds": None},
+            "Poll frequency must be",
+            id="frequency-none",
+        ),
+        pytest.param(
+            {"poll_frequency_seconds": 0}, "Poll frequency must be", id="frequency-0"
+        ),
+        pytest.param({"poll_backoff": None}, "Poll backoff must be", id="backoff-none"),
+        pytest.param({"poll_backoff": 0.5}, "Poll backoff must be", id="backoff-0.5"),
+    ],
+)
+def test_run_job_with_wait_invalid_polling_raises(rsps, poll_kwargs, msg_match):
     with pytest.raises(DbtCloudConfigurationException, match=msg_match):
-        test_flow().result().result()
-
-
-@responses.activate
-def test_run_job_failed_raises():
-    account_id = 123
-    job_id = 123
-    url = f"https://cloud.getdbt.com/api/v2/accounts/{account_id}/jobs/{job_id}/run/"
+        run_job.fn(
+            cause="abc",
+            account_id=123,
+            job_id=123,
+            token="abc",
+            wait_for_job_run_completion=True,
+            **poll_kwargs,
+        )
 
-    responses.add(
-        responses.POST,
-        url,
-        status=123,
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
-    )
+    # The job run is not triggered
+    assert len(rsps.calls) == 0
 
-    @flow
-    def test_flow():
-        return run_job(cause="abc", account_id=account_id, job_id=job_id, token="abc")
 
-    with pytest.raises(TriggerDbtCloudRunFailed):
-        test_flow().result().result()
+def test_run_job_does_not_cache_results():
+    cache_policies = pytest.importorskip("prefect.cache_policies")
 
+    assert run_job.cache_policy is cache_policies.NO_CACHE
 
-@responses.activate
-def test_run_job_with_wait_failed_raises():
-    account_id = 123
-    job_id = 123
-    trigger_url = (
-        f"https://cloud.getdbt.com/api/v2/accounts/{account_id}/jobs/{job_id}/run/"
-    )
-    get_run_url = f"https://cloud.getdbt.com/api/v2/accounts/{account_id}/runs/123/"
 
-    responses.add(
-        responses.POST,
-        trigger_url,
-        status=200,
-        json={"data": {"id": 123}},
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
-    )
-
-    responses.add(
-        responses.GET,
-        get_run_url,
-        status=123,
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
-    )
+@pytest.mark.parametrize(
+    "stubs, exc",
+    [
+        pytest.param(
+            {"trigger_status": 123}, TriggerDbtCloudRunFailed, id="trigger-failed"
+        ),
+        pytest.param({"get_status": 123}, GetDbtCloudRunFailed, id="get-run-failed"),
+        pytest.param({"run_status": 20}, DbtCloudRunFailed, id="status-20"),
+        pytest.param({"run_status": 30}, DbtCloudRunCanceled, id="status-30"),
+    ],
+)
+def test_run_job_with_wait_failed_raises(rsps, stubs, exc):
+    _register_run_stubs(rsps, 123, 123, **stubs)
 
-    @flow
-    def test_flow():
-        return run_job(
+    with pytest.raises(exc):
+        run_job.fn(
             cause="abc",
-            account_id=account_id,
-            job_id=job_id,
+            account_id=123,
+            job_id=123,
             token="abc",
             wait_for_job_run_completion=True,
         )
 
-    with pytest.raises(GetDbtCloudRunFailed):
-        test_flow().result().result()
-
-
-@responses.activate
-def test_run_job_with_wait_status_20_raises():
-    account_id = 123
-    job_id = 123
-    trigger_url = (
-        f"https://cloud.getdbt.com/api/v2/accounts/{account_id}/jobs/{job_id}/run/"
-    )
-    get_run_url = f"https://cloud.getdbt.com/api/v2/accounts/{account_id}/runs/123/"
-
-    responses.add(
-        responses.POST,
-        trigger_url,
-        status=200,
-        json={"data": {"id": 123}},
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
-    )
 
-    responses.add(
-        responses.GET,
-        get_run_url,
-        status=200,
-        json={"data": {"status": 20, "finished_at": "2019-08-24T14:15:22Z"}},
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
-    )
+def test_run_job_timeout_expires_raises(rsps):
+    _register_run_stubs(rsps, 123, 123, pending_polls=1)
 
-    @flow
-    def test_flow():
-        return run_job(
+    with pytest.raises(DbtCloudRunTimedOut):
+        run_job.fn(
             cause="abc",
-            account_id=account_id,
-            job_id=job_id,
+            account_id=123,
+            job_id=123,
             token="abc",
             wait_for_job_run_completion=True,
+            max_wait_time=5,
         )
 
-    with pytest.raises(DbtCloudRunFailed):
-        test_flow().result().result()
-
-
-@responses.activate
-def test_run_job_with_wait_status_30_raises():
-    account_id = 123
-    job_id = 123
-    trigger_url = (
-        f"https://cloud.getdbt.com/api/v2/accounts/{account_id}/jobs/{job_id}/run/"
-    )
-    get_run_url = f"https://cloud.getdbt.com/api/v2/accounts/{account_id}/runs/123/"
 
-    responses.add(
-        responses.POST,
-        trigger_url,
-        status=200,
-        json={"data": {"id": 123}},
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
-    )
+def test_run_job_with_wait_polls_with_backoff(rsps, fake_clock):
+    _register_run_stubs(rsps, 123, 123, pending_polls=2, run_status=10, artifacts=[])
 
-    responses.add(
-        responses.GET,
-        get_run_url,
-        status=200,
-        json={"data": {"status": 30, "finished_at": "2019-08-24T14:15:22Z"}},
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
+    run_job.fn(
+        cause="abc",
+        account_id=123,
+        job_id=123,
+        token="abc",
+        wait_for_job_run_completion=True,
+        poll_frequency_seconds=2,
+        poll_backoff=1.5,
     )
 
-    @flow
-    def test_flow():
-        return run_job(
-            cause="abc",
-            account_id=account_id,
-            job_id=job_id,
-            token="abc",
-            wait_for_job_run_completion=True,
-        )
+    assert fake_clock.sleeps == [2, 3.0]
 
-    with pytest.raises(DbtCloudRunCanceled):
-        test_flow().result().result()
 
+def test_run_job_with_wait_completed_on_trigger_skips_polling(rsps):
+    run = {"id": 123, "status": 10, "finished_at": _FINISHED_AT}
+    _register_run_stubs(rsps, 123, 123, trigger_data=run, artifacts=["manifest.json"])
 
-@responses.activate
-def test_run_job_timeout_expires_raises():
-    account_id = 123
-    job_id = 123
-    trigger_url = (
-        f"https://cloud.getdbt.com/api/v2/accounts/{account_id}/jobs/{job_id}/run/"
+    r = run_job.fn(
+        cause="abc",
+        account_id=123,
+        job_id=123,
+        token="abc",
+        wait_for_job_run_completion=True,
     )
-    get_run_url = f"https://cloud.getdbt.com/api/v2/accounts/{account_id}/runs/123/"
 
-    responses.add(
-        responses.POST,
-        trigger_url,
-        status=200,
-        json={"data": {"id": 123}},
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
-    )
+    assert r == {
+        **run,
+        "artifact_urls": [f"{_artifacts_url(123, 123)}manifest.json"],
+    }
+    assert len(rsps.calls) == 2
 
-    responses.add(
-        responses.GET,
-        get_run_url,
-        status=200,
-        json={"data": {"finished_at": None}},
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
+
+def test_run_job_with_wait_failed_on_trigger_raises(rsps):
+    _register_run_stubs(
+        rsps,
+        123,
+        123,
+        trigger_data={"id": 123, "status": 20, "finished_at": _FINISHED_AT},
     )
 
-    @flow
-    def test_flow():
-        return run_job(
+    with pytest.raises(DbtCloudRunFailed):
+        run_job.fn(
             cause="abc",
-            account_id=account_id,
-            job_id=job_id,
+            account_id=123,
+            job_id=123,
             token="abc",
             wait_for_job_run_completion=True,
-            max_wait_time=5,
         )
 
-    with pytest.raises(DbtCloudRunTimedOut):
-        test_flow().result().result()
 
+def test_run_job_trigger_job(rsps):
+    _register_run_stubs(rsps, 123, 123, trigger_data={"foo": "bar"})
 
-@responses.activate
-def test_run_job_trigger_job():
-    account_id = 123
-    job_id = 123
-    url = f"https://cloud.getdbt.com/api/v2/accounts/{account_id}/jobs/{job_id}/run/"
-
-    responses.add(
-        responses.POST,
-        url,
-        json={"data": {"foo": "bar"}},
-        status=200,
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
-    )
-
-    @flow
-    def test_flow():
-        return run_job(cause="abc", account_id=account_id, job_id=job_id, token="abc")
-
-    response = test_flow().result().result()
+    response = run_job.fn(cause="abc", account_id=123, job_id=123, token="abc")
 
     assert response == {"foo": "bar"}
 
 
-@responses.activate
-def test_run_job_trigger_job_with_custom_domain():
-    account_id = 123
-    job_id = 123
+def test_run_job_trigger_job_with_custom_domain(rsps):
     api_domain = "cloud.corp.getdbt.com"
-    url = f"https://{api_domain}/api/v2/accounts/{account_id}/jobs/{job_id}/run/"
-
-    responses.add(
-        responses.POST,
-        url,
-        json={"data": {"foo": "bar"}},
-        status=200,
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
+    _register_run_stubs(
+        rsps, 123, 123, trigger_data={"foo": "bar"}, api_domain=api_domain
     )
 
-    @flow
-    def test_flow():
-        return run_job(
-            cause="abc",
-            account_id=account_id,
-            job_id=job_id,
-            token="abc",
-            api_domain=api_domain,
-        )
-
-    response = test_flow().result().result()
+    response = run_job.fn(
+        cause="abc",
+        account_id=123,
+        job_id=123,
+        token="abc",
+        api_domain=api_domain,
+    )
 
     assert response == {"foo": "bar"}
 
 
-@responses.activate
-def test_dbt_cloud_run_job_trigger_job_with_wait():
-    account_id = 1234
-    job_id = 1234
+def test_dbt_cloud_run_job_trigger_job_with_wait(rsps):
+    artifacts = ["manifest.json", "run_results.json", "catalog.json"]
+    _register_run_stubs(rsps, 1234, 1234, run_status=10, artifacts=artifacts)
 
-    trigger_url = (
-        f"https://cloud.getdbt.com/api/v2/accounts/{account_id}/jobs/{job_id}/run/"
+    r = run_job.fn(
+        cause="foo",
+        account_id=1234,
+        job_id=1234,
+        token="foo",
+        wait_for_job_run_completion=True,
     )
-    get_run_url = f"https://cloud.getdbt.com/api/v2/accounts/{account_id}/runs/123/"
 
-    responses.add(
-        responses.POST,
-        trigger_url,
-        status=200,
-        json={"data": {"id": 123}},
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
-    )
+    artifacts_url = _artifacts_url(1234, 123)
+    assert r == {
+        "id": 123,
+        "status": 10,
+        "finished_at": _FINISHED_AT,
+        "artifact_urls": [f"{artifacts_url}{name}" for name in artifacts],
+    }
 
-    responses.add(
-        responses.GET,
-        get_run_url,
-        status=200,
-        json={"data": {"id": 1, "status": 10, "finished_at": "2019-08-24T14:15:22Z"}},
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
+
+def test_dbt_cloud_run_job_trigger_job_with_wait_custom(rsps):
+    api_domain = "cloud.corp.getdbt.com"
+    artifacts = ["manifest.json", "run_results.json", "catalog.json"]
+    _register_run_stubs(
+        rsps,
+        1234,
+        1234,
+        run_id=1,
+        run_status=10,
+        artifacts=artifacts,
+        api_domain=api_domain,
     )
 
-    responses.add(
-        responses.GET,
-        f"https://cloud.getdbt.com/api/v2/accounts/{account_id}/runs/123/artifacts/",
-        status=200,
-        json={"data": ["manifest.json", "run_results.json", "catalog.json"]},
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
+    r = run_job.fn(
+        cause="foo",
+        account_id=1234,
+        job_id=1234,
+        token="foo",
+        wait_for_job_run_completion=True,
+        api_domain=api_domain,
     )
 
-    @flow
-    def test_flow():
-        return run_job(
+    artifacts_url = _artifacts_url(1234, 1, api_domain=api_domain)
+    assert r == {
+        "id": 1,
+        "status": 10,
+        "finished_at": _FINISHED_AT,
+        "artifact_urls": [f"{artifacts_url}{name}" for name in artifacts],
+    }
+
+
+def test_dbt_cloud_run_job_trigger_job_with_fail_on_artifacts(rsps):
+    _register_run_stubs(rsps, 1234, 1234, run_id=1, run_status=10, artifacts_status=123)
+
+    # run_job logs a warning, which requires a Prefect run context
+    r = _harness(
+        run_job,
+        dict(
             cause="foo",
-            account_id=account_id,
-            job_id=job_id,
+            account_id=1234,
+            job_id=1234,
             token="foo",
             wait_for_job_run_completion=True,
-        )
-
-    r = test_flow().result().result()
+            api_domain="cloud.getdbt.com",
+        ),
+    )
 
     assert r == {
         "id": 1,
         "status": 10,
-        "finished_at": "2019-08-24T14:15:22Z",
-        "artifact_urls": [
-            f"{get_run_url}artifacts/manifest.json",
-            f"{get_run_url}artifacts/run_results.json",
-            f"{get_run_url}artifacts/catalog.json",
-        ],
+        "finished_at": _FINISHED_AT,
+        "artifact_urls": [],
     }
 
 
-@responses.activate
-def test_dbt_cloud_run_job_trigger_job_with_wait_custom():
-    account_id = 1234
-    job_id = 1234
+@mock.patch.dict(os.environ, {"ACCT_ID": "123", "JOB": "123", "TKN": "abc"})
+def test_run_job_with_env_vars(rsps):
 
-    trigger_run_url = (
-        f"https://cloud.corp.getdbt.com/api/v2/accounts/{account_id}/jobs/{job_id}/run/"
-    )
+    _register_run_stubs(rsps, 123, 123, run_id=1)
 
-    get_run_url = f"https://cloud.corp.getdbt.com/api/v2/accounts/{account_id}/runs/1/"
+    account_id_env_var_name = "ACCT_ID"
+    job_id_env_var_name = "JOB"
+    token_env_var_name = "TKN"
 
-    responses.add(
-        responses.POST,
-        trigger_run_url,
-        status=200,
-        json={"data": {"id": 1}},
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
+    r = run_job.fn(
+        account_id_env_var_name=account_id_env_var_name,
+        job_id_env_var_name=job_id_env_var_name,
+        token_env_var_name=token_env_var_name,
+        wait_for_job_run_completion=False,
+        cause="test",
     )
 
-    responses.add(
-        responses.GET,
-        get_run_url,
-        status=200,
-        json={"data": {"id": 1, "status": 10, "finished_at": "2019-08-24T14:15:22Z"}},
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
+    assert r == {"id": 1}
+
+
+@mock.patch.dict(os.environ, {"ACCOUNT_ID": "456", "DBT_CLOUD_TOKEN": "env"})
+def test_resolve_credentials_prefers_explicit_values():
+    credentials = _resolve_credentials(
+        account_id=123,
+        token="abc",
+        api_domain="cloud.corp.getdbt.com",
+        account_id_env_var_name="ACCOUNT_ID",
+        token_env_var_name="DBT_CLOUD_TOKEN",
     )
 
-    responses.add(
-        responses.GET,
-        f"https://cloud.corp.getdbt.com/api/v2/accounts/{account_id}/runs/1/artifacts/",
-        status=200,
-        json={"data": ["manifest.json", "run_results.json", "catalog.json"]},
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
+    assert credentials == (123, "abc", "cloud.corp.getdbt.com")
+
+
+@mock.patch.dict(os.environ, {"ACCOUNT_ID": "456", "DBT_CLOUD_TOKEN": "env"})
+def test_resolve_credentials_from_env_vars():
+    credentials = _resolve_credentials(
+        account_id=None,
+        token=None,
+        api_domain=None,
+        account_id_env_var_name="ACCOUNT_ID",
+        token_env_var_name="DBT_CLOUD_TOKEN",
     )
 
-    @flow
-    def test_flow():
-        return run_job(
-            cause="foo",
-            account_id=account_id,
-            job_id=job_id,
-            token="foo",
-            wait_for_job_run_completion=True,
-            api_domain="cloud.corp.getdbt.com",
-        )
+    assert credentials == (456, "env", "cloud.getdbt.com")
 
-    r = test_flow().result().result()
 
-    assert r == {
-        "id": 1,
-        "status": 10,
-        "finished_at": "2019-08-24T14:15:22Z",
-        "artifact_urls": [
-            f"{get_run_url}artifacts/manifest.json",
-            f"{get_run_url}artifacts/run_results.json",
-            f"{get_run_url}artifacts/catalog.json",
-        ],
-    }
+@pytest.mark.parametrize(
+    "token, env",
+    [
+        pytest.param("abc", {}, id="explicit-token"),
+        pytest.param(None, {"DBT_CLOUD_TOKEN": "env"}, id="token-from-env"),
+    ],
+)
+def test_resolve_credentials_empty_api_domain_uses_default(token, env):
+    with mock.patch.dict(os.environ, env):
+        credentials = _resolve_credentials(
+            account_id=123,
+            token=token,
+            api_domain="",
+            account_id_env_var_name="ACCOUNT_ID",
+            token_env_var_name="DBT_CLOUD_TOKEN",
+        )
 
+    assert credentials.api_domain == "cloud.getdbt.com"
 
-@responses.activate
-def test_dbt_cloud_run_job_trigger_job_with_fail_on_artifacts():
-    account_id = 1234
-    job_id = 1234
 
-    responses.add(
-        responses.POST,
-        f"https://cloud.getdbt.com/api/v2/accounts/{account_id}/jobs/{job_id}/run/",
-        status=200,
-        json={"data": {"id": 1}},
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
-    )
+def test_get_client_reuses_client():
+    client = _get_client(account_id=123, token="abc", api_domain="cloud.getdbt.com")
 
-    responses.add(
-        responses.GET,
-        f"https://cloud.getdbt.com/api/v2/accounts/{account_id}/runs/1/",
-        status=200,
-        json={"data": {"id": 1, "status": 10, "finished_at": "2019-08-24T14:15:22Z"}},
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
+    assert client is _get_client(
+        account_id=123, token="abc", api_domain="cloud.getdbt.com"
     )
-
-    responses.add(
-        responses.GET,
-        f"https://cloud.getdbt.com/api/v2/accounts/{account_id}/runs/1/artifacts/",
-        status=123,
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
+    assert client is not _get_client(
+        account_id=123, token="def", api_domain="cloud.getdbt.com"
     )
 
-    @flow
-    def test_flow():
-        return run_job(
-            cause="foo",
-            account_id=account_id,
-            job_id=job_id,
-            token="foo",
-            wait_for_job_run_completion=True,
-            api_domain="cloud.getdbt.com",
+
+def test_run_jobs_batch_trigger_jobs(rsps):
+    account_id = 123
+    job_ids = [123, 456, 789]
+
+    for job_id in job_ids:
+        rsps.add(
+            responses.POST,
+            _trigger_url(account_id, job_id),
+            status=200,
+            json={"data": {"id": job_id * 10}},
+            match=[
+                *_AGENT_MATCH,
+                matchers.urlencoded_params_matcher(
+                    {"cause": "abc", "git_branch": "main"}
+                ),
+            ],
         )
 
-    r = test_flow().result().result()
+    additional_args = {"git_branch": "main"}
 
-    assert r == {
-        "id": 1,
-        "status": 10,
-        "finished_at": "2019-08-24T14:15:22Z",
-        "artifact_urls": [],
-    }
+    r = run_jobs_batch.fn(
+        job_ids=job_ids,
+        cause="abc",
+        account_id=account_id,
+        token="abc",
+        additional_args=additional_args,
+        max_concurrency=2,
+    )
 
+    assert r == [{"id": 1230}, {"id": 4560}, {"id": 7890}]
+    assert additional_args == {"git_branch": "main"}
 
-@responses.activate
-@mock.patch.dict(os.environ, {"ACCT_ID": "123", "JOB": "123", "TKN": "abc"})
-def test_run_job_with_env_vars():
 
-    responses.add(
+def test_run_jobs_batch_trigger_job_failed_raises(rsps):
+    account_id = 123
+
+    rsps.add(
         responses.POST,
-        "https://cloud.getdbt.com/api/v2/accounts/123/jobs/123/run/",
-        status=200,
-        json={"data": {"id": 1}},
-        match=[matchers.header_matcher(dbtCloudClient.get_agent_header())],
+        _trigger_url(account_id, 123),
+        status=500,
+        match=_AGENT_MATCH,
     )
 
-    account_id_env_var_name = "ACCT_ID"
-    job_id_env_var_name = "JOB"
-    token_env_var_name = "TKN"
+    rsps.add(
+        responses.POST,
+        _trigger_url(account_id, 456),
+        status=200,
+        json={"data": {"id": 99}},
+        match=_AGENT_MATCH,
+    )
 
-    @flow
-    def test_flow():
-        return run_job(
-            account_id_env_var_name=account_id_env_var_name,
-            job_id_env_var_name=job_id_env_var_name,
-            token_env_var_name=token_env_var_name,
-            wait_for_job_run_completion=False,
-            cause="test",
+    with pytest.raises(TriggerDbtCloudRunFailed) as exc_info:
+        run_jobs_batch.fn(
+            job_ids=[123, 456], cause="abc", account_id=account_id, token="abc"
         )
 
-    r = test_flow().result().result()
+    # The job run triggered despite the failure is reported
+    assert isinstance(exc_info.value, TriggerDbtCloudRunsFailed)
+    assert exc_info.value.job_runs == [None, {"id": 99}]
+    assert "Job runs triggered: [99]" in str(exc_info.value)
 
-    assert r == {"id": 1}
+
+@pytest.mark.parametrize("max_concurrency", [0, None])
+def test_run_jobs_batch_invalid_max_concurrency_raises(rsps, max_concurrency):
+    with pytest.raises(DbtCloudConfigurationException, match="Max concurrency"):
+        run_jobs_batch.fn(
+            job_ids=[123],
+            cause="abc",
+            account_id=123,
+            token="abc",
+            max_concurrency=max_concurrency,
+        )
+
+    assert len(rsps.calls) == 0
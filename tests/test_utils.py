@@ -0,0 +1,103 @@
+import pytest
+import responses
+from responses import matchers
+
+from prefect_dbtcloud.exceptions import DbtCloudRunTimedOut
+from prefect_dbtcloud.utils import dbtCloudClient
+
+_AGENT_MATCH = [matchers.header_matcher(dbtCloudClient.get_agent_header())]
+_RUN_URL = "https://cloud.getdbt.com/api/v2/accounts/123/runs/1/"
+
+
+def test_list_run_artifact_links(rsps):
+    account_id = 123
+    run_url = f"https://cloud.getdbt.com/api/v2/accounts/{account_id}/runs/1/"
+
+    rsps.add(
+        responses.GET,
+        f"{run_url}artifacts/",
+        status=200,
+        json={"data": ["manifest.json", "run_results.json"]},
+        match=_AGENT_MATCH,
+    )
+
+    client = dbtCloudClient(account_id=account_id, token="abc")
+
+    assert client.list_run_artifact_links(run_id=1) == [
+        (f"{run_url}artifacts/manifest.json", "manifest.json"),
+        (f"{run_url}artifacts/run_results.json", "run_results.json"),
+    ]
+
+
+def test_client_session_retries_connection_errors():
+    client = dbtCloudClient(account_id=123, token="abc")
+
+    adapter = client.session.get_adapter("https://cloud.getdbt.com")
+
+    assert adapter.max_retries.total == 3
+    assert "POST" not in adapter.max_retries.allowed_methods
+
+
+@pytest.mark.parametrize("status_code", [413, 429, 503])
+def test_client_session_does_not_retry_responses(status_code):
+    client = dbtCloudClient(account_id=123, token="abc")
+
+    adapter = client.session.get_adapter("https://cloud.getdbt.com")
+
+    assert not adapter.max_retries.is_retry("GET", status_code, has_retry_after=True)
+
+
+@pytest.mark.parametrize(
+    "jitter, max_wait_time, sleeps, elapsed",
+    [
+        pytest.param(0, 25, [10, 10, 5], 25, id="clamped-to-deadline"),
+        pytest.param(1, 30, [11, 11, 8], 30, id="with-jitter"),
+    ],
+)
+def test_wait_for_job_run_times_out(
+    rsps, fake_clock, monkeypatch, jitter, max_wait_time, sleeps, elapsed
+):
+    monkeypatch.setattr("prefect_dbtcloud.utils.uniform", lambda a, b: b * jitter)
+
+    rsps.add(
+        responses.GET,
+        _RUN_URL,
+        status=200,
+        json={"data": {"finished_at": None}},
+        match=_AGENT_MATCH,
+    )
+
+    client = dbtCloudClient(account_id=123, token="abc")
+
+    with pytest.raises(DbtCloudRunTimedOut, match=f"after {elapsed} seconds"):
+        client.wait_for_job_run(
+            run_id=1,
+            max_wait_time=max_wait_time,
+            poll_frequency_seconds=10,
+            poll_backoff=1,
+        )
+
+    assert fake_clock.sleeps == sleeps
+
+
+def test_wait_for_job_run_keeps_frequency_above_backoff_cap(rsps, fake_clock):
+    for _ in range(3):
+        rsps.add(
+            responses.GET,
+            _RUN_URL,
+            status=200,
+            json={"data": {"finished_at": None}},
+            match=_AGENT_MATCH,
+        )
+    rsps.add(
+        responses.GET,
+        _RUN_URL,
+        status=200,
+        json={"data": {"id": 1, "status": 10, "finished_at": "2019-08-24T14:15:22Z"}},
+        match=_AGENT_MATCH,
+    )
+
+    client = dbtCloudClient(account_id=123, token="abc")
+    client.wait_for_job_run(run_id=1, poll_frequency_seconds=120, poll_backoff=1)
+
+    assert fake_clock.sleeps == [120, 120, 120]